@@ -1,124 +1,203 @@
 import datetime
-import re
-
-# Proud regex code which factors in all requirements
-# (except range of values and truncation consistency to raise errors for)
-datetime_regex = re.compile(
-    r"""(?x)
-
-    ^
-    (?# parse yyyy-mm-dd or yyyymmdd date)
-    (?P<year>\d{4})(?P<hyphen>-?)(?P<month>\d{2})(?P=hyphen)(?P<day>\d{2})
-
-    (?# parse hh, hhmm, hh:mm, hhmmss, hh:mm:ss, hhmmss.ssssss or hh:mm:ss.ssssss time)
-    (?# seconds up to 6 decimal places)
-    (?:
-        T
-        (?P<hour>\d{2})
-        (?:
-            (?P<colon>:?) (?# *can be substituted to validate truncation consistency)
-            (?P<minute>\d{2})
-            (?:
-                (?P=colon)
-                (?P<second>\d{2})
-                (?:\.(?P<subsecond>\d{1,6}))?
-            )?
-        )?
-    )?
-
-    (?# parse Z, ±hh, ±hhmm or ±hh:mm timezone)
-    (?P<timezone>Z|
-        (?P<sign>\+|-)
-        (?P<tz_hour>\d{2})
-        (?::?(?P<tz_minute>\d{2}))?
-    )?
-    $
-    """
+import functools
+import typing
+
+# The formats in README.md have a near-fixed layout, so instead of running a regex
+# we scan the string at known offsets. The offsets only depend on whether the date
+# is truncated (yyyymmdd) or not (yyyy-mm-dd), which we can tell from the fifth
+# character. That also decides the time separator, which keeps truncation consistent.
+
+_FORMAT_ERROR_MESSAGE = (
+    "The string is not in the format as specified by ISO-8601 "
+    "(limited to the requirements in README.md)."
 )
-# * substitution:
-# (?P<colon>((?<=-\d\dT\d\d):|(?<!-\d\dT\d\d)))
-# Python's regex engine does not support lookarounds in conditionals
-# Therefore we use two lookarounds with an OR operator
+_TRUNCATION_ERROR_MESSAGE = "Date and time must be both truncated or untruncated."
+_YEAR_ERROR_MESSAGE = "The year value is out of range."
+_MONTH_ERROR_MESSAGE = "The month value is out of range."
+_DAY_ERROR_MESSAGE = "The day value is out of range for the month."
+_HOUR_ERROR_MESSAGE = "The hour value is out of range."
+_MINUTE_ERROR_MESSAGE = "The minute value is out of range."
+_SECOND_ERROR_MESSAGE = "The second value is out of range."
+_TZ_HOUR_ERROR_MESSAGE = "The timezone hour offset value is out of range."
+_TZ_MINUTE_ERROR_MESSAGE = "The timezone minute offset value is out of range."
+
+# Indexed by month; February gets corrected for leap years when it's needed
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Every character that can appear in a supported timestamp
+_VALID_CHARS = frozenset("0123456789T:-+.Z")
+
+# Timezones keyed by their signed offset in minutes, so streams of timestamps from
+# the same source share one instance. The range checks on the offset bound this
+# to a few thousand entries.
+_TIMEZONE_CACHE: typing.Dict[int, datetime.timezone] = {0: datetime.timezone.utc}
+
+
+def _is_digits(value: str, width: int) -> bool:
+    """Check if the slice consists of exactly `width` digits."""
+    # Slicing past the end of the string gives a shorter slice, so this also
+    # catches strings that are cut off in the middle of a field. str.isdigit on
+    # its own would also accept other Unicode digits, which ISO-8601 doesn't use;
+    # parse_iso8601 filters those out with _VALID_CHARS before checking any field.
+    return len(value) == width and value.isdigit()
 
 
 def parse_iso8601(timestamp: str) -> datetime.datetime:
     """Parse an ISO-8601 formatted time stamp."""
-    if match := re.match(datetime_regex, timestamp):
-        assert match is not None  # does mypy not detect that condiitonal above?
-        # Check truncation consistency
-        date_seperator = match.group("hyphen")  # "-" or ""
-        time_seperator = match.group("colon")  # ":", "" or None
-        if time_seperator is not None and (bool(date_seperator) != bool(time_seperator)):
-            raise ValueError("Date and time must be both truncated or untruncated.")
-
-        # Check year, month and time first because they're simple
-        if (year := int(match.group("year"))) < 1:
-            raise ValueError("The year value is out of range.")
-        if not 1 <= (month := int(match.group("month"))) <= 12:
-            raise ValueError("The month value is out of range.")
-        if not 0 <= (hour := int(match.group("hour") or 0)) <= 23:
-            raise ValueError("The hour value is out of range.")
-        if not 0 <= (minute := int(match.group("minute") or 0)) <= 59:
-            raise ValueError("The minute value is out of range.")
-        if not 0 <= (second := int(match.group("second") or 0)) <= 59:
-            # datetime.datetime does not support leap seconds
-            raise ValueError("The second value is out of range.")
-        
-        # Check microsecond
-        if (subsec_match := match.group("subsecond")) is not None:
-            microsecond = int(float(f"0.{subsec_match}") * 1000000)
-        else:
-            microsecond = 0
-
-        # Check timezone
-        if (timezone := match.group("timezone")) is None:
-            tzinfo = None
-        elif timezone == "Z":
-            tzinfo = datetime.timezone.utc
-        else:
-            if not 0 <= (tz_hour := int(match.group("tz_hour"))) <= 23:
-                raise ValueError("The timezone hour offset value is out of range.")
-            if not 0 <= (tz_minute := int(match.group("tz_minute") or 0)) <= 59:
-                raise ValueError("The timezone minute offset value is out of range.")
-            sign = 1 if match.group("sign") == "+" else -1
-            tzinfo = datetime.timezone(
-                datetime.timedelta(hours=tz_hour * sign, minutes=tz_minute * sign)
-            )
-
-        # Check day with respect to month and leap years
-        days_in_february = 28
-        if year % 4 == 0:
-            days_in_february = 29
-        if year % 100 == 0 and year % 400 != 0:
-            days_in_february = 28
-        days_in_month = {
-            1: 31,
-            2: days_in_february,
-            3: 31,
-            4: 30,
-            5: 31,
-            6: 30,
-            7: 31,
-            8: 31,
-            9: 30,
-            10: 31,
-            11: 30,
-            12: 31,
-        }
-        if not 1 <= (day := int(match.group("day"))) <= days_in_month[month]:
-            raise ValueError("The day value is out of range for the month.")
-        return datetime.datetime(
-            year=year,
-            month=month,
-            day=day,
-            hour=hour,
-            minute=minute,
-            second=second,
-            microsecond=microsecond,
-            tzinfo=tzinfo,
-        )
-
-    raise ValueError(
-        "The string is not in the format as specified by ISO-8601 "
-        "(limited to the requirements in README.md)."
+    length = len(timestamp)
+
+    # The shortest valid timestamp is yyyymmdd and the longest one is
+    # yyyy-mm-ddThh:mm:ss.ssssss+hh:mm, so anything else can be rejected right away
+    if not 8 <= length <= 32:
+        raise ValueError(_FORMAT_ERROR_MESSAGE)
+    # Filter out stray characters before scanning any of the fields. This also
+    # guarantees the rest of the function only ever sees ASCII.
+    if not _VALID_CHARS.issuperset(timestamp) or not _is_digits(timestamp[0:4], 4):
+        raise ValueError(_FORMAT_ERROR_MESSAGE)
+
+    # parse yyyy-mm-dd or yyyymmdd date
+    if timestamp[4:5] == "-":
+        if timestamp[7:8] != "-":
+            raise ValueError(_FORMAT_ERROR_MESSAGE)
+        year_str, month_str, day_str = timestamp[0:4], timestamp[5:7], timestamp[8:10]
+        time_seperator, seperator_width = ":", 1
+        pos = 10
+    else:
+        year_str, month_str, day_str = timestamp[0:4], timestamp[4:6], timestamp[6:8]
+        time_seperator, seperator_width = "", 0
+        pos = 8
+    if not (_is_digits(month_str, 2) and _is_digits(day_str, 2)):
+        raise ValueError(_FORMAT_ERROR_MESSAGE)
+
+    # parse hh, hhmm, hh:mm, hhmmss, hh:mm:ss, hhmmss.ssssss or hh:mm:ss.ssssss time
+    hour_str = minute_str = second_str = subsec_str = None
+    mixed_truncation = False
+    if timestamp[pos:pos + 1] == "T":
+        hour_str = timestamp[pos + 1:pos + 3]
+        if not _is_digits(hour_str, 2):
+            raise ValueError(_FORMAT_ERROR_MESSAGE)
+        pos += 3
+
+        # If the minute follows the hour with the other separator than the date
+        # implies, scan the rest of the time with that separator instead. The
+        # mismatch is only reported once the whole timestamp turned out to be
+        # well-formed, so a format error still takes precedence.
+        if seperator_width:
+            if _is_digits(timestamp[pos:pos + 2], 2):
+                time_seperator, seperator_width = "", 0
+                mixed_truncation = True
+        elif timestamp[pos:pos + 1] == ":" and _is_digits(timestamp[pos + 1:pos + 3], 2):
+            time_seperator, seperator_width = ":", 1
+            mixed_truncation = True
+
+        field_start = pos + seperator_width
+        if (
+            timestamp[pos:field_start] == time_seperator
+            and _is_digits(timestamp[field_start:field_start + 2], 2)
+        ):
+            minute_str = timestamp[field_start:field_start + 2]
+            pos = field_start + 2
+
+            field_start = pos + seperator_width
+            if (
+                timestamp[pos:field_start] == time_seperator
+                and _is_digits(timestamp[field_start:field_start + 2], 2)
+            ):
+                second_str = timestamp[field_start:field_start + 2]
+                pos = field_start + 2
+
+                # seconds up to 6 decimal places
+                if timestamp[pos:pos + 1] == ".":
+                    end = pos + 1
+                    while end < length and timestamp[end] in "0123456789":
+                        end += 1
+                    subsec_str = timestamp[pos + 1:end]
+                    if not 1 <= len(subsec_str) <= 6:
+                        raise ValueError(_FORMAT_ERROR_MESSAGE)
+                    pos = end
+
+    # parse Z, ±hh, ±hhmm or ±hh:mm timezone
+    timezone = timestamp[pos:]
+    tz_hour_str = tz_minute_str = None
+    if timezone and timezone != "Z":
+        if timezone[0] not in "+-":
+            raise ValueError(_FORMAT_ERROR_MESSAGE)
+        tz_hour_str = timezone[1:3]
+        tz_length = len(timezone)
+        if tz_length == 5:
+            tz_minute_str = timezone[3:5]
+        elif tz_length == 6 and timezone[3] == ":":
+            tz_minute_str = timezone[4:6]
+        elif tz_length != 3:
+            raise ValueError(_FORMAT_ERROR_MESSAGE)
+        if not _is_digits(tz_hour_str, 2) or (
+            tz_minute_str is not None and not _is_digits(tz_minute_str, 2)
+        ):
+            raise ValueError(_FORMAT_ERROR_MESSAGE)
+
+    # Check truncation consistency
+    if mixed_truncation:
+        raise ValueError(_TRUNCATION_ERROR_MESSAGE)
+
+    # Check year, month and time first because they're simple
+    # every field was validated as a run of digits, so none of them can be negative
+    if (year := int(year_str)) < 1:
+        raise ValueError(_YEAR_ERROR_MESSAGE)
+    if (month := int(month_str)) > 12 or month == 0:
+        raise ValueError(_MONTH_ERROR_MESSAGE)
+    # Missing time fields default to 0 and can't be out of range, so a date-only
+    # timestamp skips these checks entirely
+    hour = minute = second = 0
+    if hour_str is not None:
+        if (hour := int(hour_str)) > 23:
+            raise ValueError(_HOUR_ERROR_MESSAGE)
+        if minute_str is not None:
+            if (minute := int(minute_str)) > 59:
+                raise ValueError(_MINUTE_ERROR_MESSAGE)
+            if second_str is not None and (second := int(second_str)) > 59:
+                # datetime.datetime does not support leap seconds
+                raise ValueError(_SECOND_ERROR_MESSAGE)
+
+    # Check microsecond
+    # padding to six digits keeps this exact, e.g. "054" -> "054000" -> 54000
+    microsecond = int(subsec_str.ljust(6, "0")) if subsec_str is not None else 0
+
+    # Check timezone
+    if not timezone:
+        tzinfo = None
+    elif timezone == "Z":
+        tzinfo = datetime.timezone.utc
+    else:
+        if (tz_hour := int(tz_hour_str)) > 23:
+            raise ValueError(_TZ_HOUR_ERROR_MESSAGE)
+        tz_minute = 0
+        if tz_minute_str is not None and (tz_minute := int(tz_minute_str)) > 59:
+            raise ValueError(_TZ_MINUTE_ERROR_MESSAGE)
+        sign = 1 if timezone[0] == "+" else -1
+        offset = sign * (tz_hour * 60 + tz_minute)
+        if (tzinfo := _TIMEZONE_CACHE.get(offset)) is None:
+            tzinfo = datetime.timezone(datetime.timedelta(minutes=offset))
+            _TIMEZONE_CACHE[offset] = tzinfo
+
+    # Check day with respect to month and leap years
+    days_in_month = _DAYS_IN_MONTH[month]
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        days_in_month = 29
+    if (day := int(day_str)) > days_in_month or day == 0:
+        raise ValueError(_DAY_ERROR_MESSAGE)
+    return datetime.datetime(
+        year=year,
+        month=month,
+        day=day,
+        hour=hour,
+        minute=minute,
+        second=second,
+        microsecond=microsecond,
+        tzinfo=tzinfo,
     )
+
+
+# Opt-in variant for callers that parse the same timestamps over and over.
+# datetime.datetime instances are immutable, so handing out the same instance for a
+# repeated timestamp is safe. Invalid timestamps raise and are never cached.
+parse_iso8601_cached = functools.lru_cache(maxsize=4096)(parse_iso8601)
@@ -187,6 +187,10 @@ class Part001_BasicRequirements(unittest.TestCase):
             "1887&12&01",  # Invalid date separator
             "1994-04-05K15:15:15",  # Invalid part separator
             "2020-01-01T100:100:100",  # Invalid time
+            "2019-03-25\n",  # A trailing newline is not part of the timestamp
+            "20190325T081230\n",  # Not even after a truncated datetime
+            "２019-03-25",  # Only ASCII digits are valid, not fullwidth ones
+            "2019-03-25T0٨:12",  # Nor digits from other scripts
         )
 
         for invalid_datestring in test_cases: